@@ -1,29 +1,301 @@
 import os
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
 import argparse
 import subprocess
 import sqlite3
+import hashlib
+import datetime
+import logging
+import threading
+import time
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import List, Union, Dict, Any, Optional
 
+try:
+    import faiss
+except ImportError:
+    faiss = None
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of texts Cohere accepts in a single /v1/embed call
+COHERE_BATCH_LIMIT = 96
+
+# Default location for the persistent embedding cache
+DEFAULT_CACHE_PATH = os.path.join("data", "embedding_cache.db")
+
+
+class EmbeddingCache:
+    """Persistent SQLite cache of embeddings keyed by the SHA-256 of their text.
+
+    A cache hit skips the paid Cohere API call entirely, which dominates
+    every other cost in the pipeline. Vectors are stored as raw float32
+    BLOBs (4 bytes per dimension) rather than JSON text.
+    """
+
+    def __init__(self, db_path: str = DEFAULT_CACHE_PATH):
+        """
+        Initialize the cache, creating the database if needed.
+
+        Args:
+            db_path: Path to the SQLite cache database
+        """
+        cache_dir = os.path.dirname(db_path)
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+        # The cache is shared by worker threads issuing concurrent batch
+        # requests, so serialize access with a lock
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute('''
+        CREATE TABLE IF NOT EXISTS embeddings (
+            hash TEXT PRIMARY KEY,
+            dim INT,
+            vec BLOB
+        )
+        ''')
+        self.conn.commit()
+
+    @staticmethod
+    def text_key(text: str) -> str:
+        """
+        Compute the cache key for a text.
+
+        Args:
+            text: The text to hash
+
+        Returns:
+            Hex digest of the SHA-256 hash of the normalized text
+        """
+        # Strip surrounding whitespace so trivial edits still hit the cache
+        return hashlib.sha256(text.strip().encode('utf-8')).hexdigest()
+
+    def get(self, text: str) -> Optional[List[float]]:
+        """
+        Look up a cached embedding for a text.
+
+        Args:
+            text: The text to look up
+
+        Returns:
+            The cached embedding vector, or None on a cache miss
+        """
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT vec FROM embeddings WHERE hash = ?",
+                (self.text_key(text),)
+            ).fetchone()
+        if row is None:
+            return None
+        return np.frombuffer(row[0], dtype=np.float32).tolist()
+
+    def put_many(self, pairs: List[tuple]) -> None:
+        """
+        Store multiple (text, embedding) pairs in a single transaction.
+
+        Args:
+            pairs: List of (text, embedding) tuples to cache
+        """
+        rows = []
+        for text, embedding in pairs:
+            vec = np.asarray(embedding, dtype=np.float32)
+            rows.append((self.text_key(text), vec.shape[0], vec.tobytes()))
+        with self._lock:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (hash, dim, vec) VALUES (?, ?, ?)",
+                rows
+            )
+            self.conn.commit()
+
+    def put(self, text: str, embedding: List[float]) -> None:
+        """
+        Store a single (text, embedding) pair.
+
+        Args:
+            text: The text the embedding was generated for
+            embedding: The embedding vector to cache
+        """
+        self.put_many([(text, embedding)])
+
+
+class SemanticCache:
+    """In-memory cache that reuses embeddings for near-duplicate texts.
+
+    Scraped jobs are often the same posting syndicated across boards with
+    trivial wording differences, which the exact-hash cache misses. Each
+    cached text is keyed by a cheap local hashed bag-of-words vector; a
+    FAISS inner-product search over the L2-normalized keys finds the
+    closest cached text, and if its cosine similarity clears the
+    threshold the stored Cohere vector is reused without an API call.
+    """
+
+    def __init__(self, threshold: float = 0.95, max_entries: int = 10000,
+                 ttl_seconds: Optional[float] = None, key_dim: int = 512):
+        """
+        Initialize the semantic cache.
+
+        Args:
+            threshold: Minimum cosine similarity to count as a hit
+            max_entries: Maximum cached texts before the oldest half is evicted
+            ttl_seconds: Entry lifetime in seconds, or None for no expiry
+            key_dim: Dimensionality of the local hashed bag-of-words keys
+        """
+        if faiss is None:
+            raise RuntimeError("faiss is required for SemanticCache")
+
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.key_dim = key_dim
+        self._lock = threading.Lock()
+        self._index = faiss.IndexFlatIP(key_dim)
+        self._embeddings: List[List[float]] = []
+        self._timestamps: List[float] = []
+
+    def _local_vector(self, text: str) -> np.ndarray:
+        """
+        Compute the cheap local key vector for a text.
+
+        Args:
+            text: The text to vectorize
+
+        Returns:
+            L2-normalized float32 hashed bag-of-words vector of shape (1, key_dim)
+        """
+        vec = np.zeros(self.key_dim, dtype=np.float32)
+        for token in text.lower().split():
+            vec[hash(token) % self.key_dim] += 1.0
+        norm = np.linalg.norm(vec)
+        if norm > 0:
+            vec /= norm
+        return vec.reshape(1, -1)
+
+    def get(self, text: str) -> Optional[List[float]]:
+        """
+        Look up a cached embedding for a near-duplicate of the text.
+
+        Args:
+            text: The text to look up
+
+        Returns:
+            The cached embedding vector, or None if no cached text is close enough
+        """
+        with self._lock:
+            if self._index.ntotal == 0:
+                return None
+
+            similarities, indices = self._index.search(self._local_vector(text), 1)
+            similarity = float(similarities[0][0])
+            idx = int(indices[0][0])
+
+            if idx < 0 or similarity < self.threshold:
+                return None
+
+            if self.ttl_seconds is not None and time.monotonic() - self._timestamps[idx] > self.ttl_seconds:
+                return None
+
+            logger.debug("Semantic cache hit (cosine %.3f)", similarity)
+            return self._embeddings[idx]
+
+    def put(self, text: str, embedding: List[float]) -> None:
+        """
+        Store a text's embedding under its local key vector.
+
+        Args:
+            text: The text the embedding was generated for
+            embedding: The Cohere embedding vector to cache
+        """
+        with self._lock:
+            if len(self._embeddings) >= self.max_entries:
+                # Evict the oldest half and rebuild the flat index
+                keep_from = len(self._embeddings) // 2
+                kept_keys = self._index.reconstruct_n(keep_from, self._index.ntotal - keep_from)
+                self._index.reset()
+                self._index.add(kept_keys)
+                self._embeddings = self._embeddings[keep_from:]
+                self._timestamps = self._timestamps[keep_from:]
+
+            self._index.add(self._local_vector(text))
+            self._embeddings.append(embedding)
+            self._timestamps.append(time.monotonic())
+
+
+class RateLimiter:
+    """Token-bucket limiter shared across worker threads.
+
+    Keeps the concurrent batch workers under Cohere's per-minute call
+    budget so we never trip 429 responses.
+    """
+
+    def __init__(self, requests_per_second: float):
+        """
+        Initialize the limiter.
+
+        Args:
+            requests_per_second: Sustained request rate to allow
+        """
+        self.interval = 1.0 / requests_per_second
+        self._lock = threading.Lock()
+        self._next_slot = time.monotonic()
+
+    def acquire(self) -> None:
+        """Block until the caller may issue the next request."""
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next_slot - now
+            self._next_slot = max(self._next_slot, now) + self.interval
+        if wait > 0:
+            time.sleep(wait)
+
 
 class Embedder:
     """A class that handles text embedding using the Cohere API."""
 
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, cache_path: Optional[str] = DEFAULT_CACHE_PATH,
+                 semantic_threshold: Optional[float] = 0.95):
         """
         Initialize the Embedder with an API key.
-        
+
         Args:
             api_key: Cohere API key. If None, will try to get from environment variables.
+            cache_path: Path to the persistent embedding cache. Pass None to disable caching.
+            semantic_threshold: Cosine threshold for the near-duplicate cache.
+                Pass None to disable semantic caching.
         """
         if api_key is None:
             api_key = os.environ.get("COHERE_API_KEY")
             if api_key is None:
                 raise ValueError("API key not provided and COHERE_API_KEY environment variable not set")
-        
+
         self.api_key = api_key
         self.endpoint = "https://api.cohere.ai/v1/embed"
+        # Build the request headers once; they never change between calls
+        self._headers = {
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json",
+            "Accept": "application/json"
+        }
+        self.cache = EmbeddingCache(cache_path) if cache_path else None
+        self.semantic_cache = None
+        if semantic_threshold is not None and faiss is not None:
+            self.semantic_cache = SemanticCache(threshold=semantic_threshold)
+
+        # Persistent session with connection pooling: reusing the TCP+TLS
+        # connection saves a ~100-300ms handshake on every embed call
+        self._session = requests.Session()
+        retries = Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=["POST"]
+        )
+        self._session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retries))
+
         print(f"[Embedder] Initialized with API key: {api_key[:5]}...")
     
     def generate_embedding(self, text: str) -> List[float]:
@@ -36,8 +308,21 @@ class Embedder:
         Returns:
             A list of floats representing the embedding vector
         """
-        print(f"[Embedder] Generating embedding for text ({len(text)} characters)...")
-        
+        logger.debug("Generating embedding for text (%d characters)...", len(text))
+
+        # Check the persistent cache first - a hit avoids the API call entirely
+        if self.cache is not None:
+            cached = self.cache.get(text)
+            if cached is not None:
+                logger.debug("Cache hit, returning stored embedding (%d dimensions)", len(cached))
+                return cached
+
+        # Fall back to the semantic cache for near-duplicate texts
+        if self.semantic_cache is not None:
+            cached = self.semantic_cache.get(text)
+            if cached is not None:
+                return cached
+
         # Prepare the payload for Cohere API
         payload = {
             "texts": [text],
@@ -45,29 +330,23 @@ class Embedder:
             "input_type": "search_document"
         }
         
-        # Set up headers
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json",
-            "Accept": "application/json"
-        }
         
         # Make the API request
         try:
-            print("[Embedder] Making API request...")
-            response = requests.post(
+            logger.debug("Making API request...")
+            response = self._session.post(
                 self.endpoint,
-                headers=headers,
+                headers=self._headers,
                 json=payload,
                 timeout=30
             )
             
-            print(f"[Embedder] API response status code: {response.status_code}")
+            logger.debug("API response status code: %d", response.status_code)
             
             # Check if request was successful
             if response.status_code != 200:
                 error_message = f"API request failed with status {response.status_code}: {response.text}"
-                print(f"[Embedder] Error: {error_message}")
+                logger.error("%s", error_message)
                 raise Exception(error_message)
             
             # Parse the response
@@ -76,22 +355,28 @@ class Embedder:
             # Extract embedding from response
             if "embeddings" in response_data and len(response_data["embeddings"]) > 0:
                 embedding = response_data["embeddings"][0]
-                print(f"[Embedder] Successfully generated embedding with {len(embedding)} dimensions")
+                logger.debug("Successfully generated embedding with %d dimensions", len(embedding))
+                if self.cache is not None:
+                    self.cache.put(text, embedding)
+                if self.semantic_cache is not None:
+                    self.semantic_cache.put(text, embedding)
                 return embedding
             else:
                 # Try alternative format
-                print("[Embedder] 'embeddings' field not found, trying alternative format")
+                logger.debug("'embeddings' field not found, trying alternative format")
                 if "embedding" in response_data:
                     embedding = response_data["embedding"]
-                    print(f"[Embedder] Successfully generated embedding with {len(embedding)} dimensions")
+                    logger.debug("Successfully generated embedding with %d dimensions", len(embedding))
+                    if self.cache is not None:
+                        self.cache.put(text, embedding)
                     return embedding
                 
                 # If we still can't find the embedding
-                print(f"[Embedder] Available keys in response: {list(response_data.keys())}")
+                logger.debug("Available keys in response: %s", list(response_data.keys()))
                 raise Exception("Embedding field not found in response")
                 
         except Exception as e:
-            print(f"[Embedder] Exception in generate_embedding: {str(e)}")
+            logger.error("Exception in generate_embedding: %s", str(e))
             raise
     
     def generate_embeddings_batch(self, texts: List[str]) -> List[List[float]]:
@@ -104,27 +389,43 @@ class Embedder:
         Returns:
             List of embedding vectors
         """
-        print(f"[Embedder] Generating embeddings for {len(texts)} texts in batch...")
-        
+        logger.debug("Generating embeddings for %d texts in batch...", len(texts))
+
+        # Resolve cache hits first and only request the misses from the API
+        results: List[Optional[List[float]]] = [None] * len(texts)
+        miss_indices = list(range(len(texts)))
+
+        if self.cache is not None or self.semantic_cache is not None:
+            miss_indices = []
+            for i, text in enumerate(texts):
+                cached = self.cache.get(text) if self.cache is not None else None
+                if cached is None and self.semantic_cache is not None:
+                    cached = self.semantic_cache.get(text)
+                if cached is not None:
+                    results[i] = cached
+                else:
+                    miss_indices.append(i)
+
+            if not miss_indices:
+                logger.debug("All %d embeddings served from cache", len(texts))
+                return results
+
+            if len(miss_indices) < len(texts):
+                logger.debug("%d cache hits, requesting %d embeddings", len(texts) - len(miss_indices), len(miss_indices))
+
         # Prepare the payload for Cohere API
         payload = {
-            "texts": texts,
+            "texts": [texts[i] for i in miss_indices],
             "model": "embed-english-v3.0",
             "input_type": "search_document"
         }
         
-        # Set up headers
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json",
-            "Accept": "application/json"
-        }
         
         # Make the API request
         try:
-            response = requests.post(
+            response = self._session.post(
                 self.endpoint,
-                headers=headers,
+                headers=self._headers,
                 json=payload,
                 timeout=240
             )
@@ -139,24 +440,74 @@ class Embedder:
             # Extract embeddings from response
             if "embeddings" in response_data:
                 embeddings = response_data["embeddings"]
-                print(f"[Embedder] Successfully generated {len(embeddings)} embeddings")
-                return embeddings
-            else:
+            elif "embedding" in response_data:
                 # Try alternative format
-                print("[Embedder] 'embeddings' field not found, trying alternative format")
-                if "embedding" in response_data:
-                    embeddings = [response_data["embedding"]]
-                    print(f"[Embedder] Successfully generated {len(embeddings)} embeddings")
-                    return embeddings
-                
+                logger.debug("'embeddings' field not found, trying alternative format")
+                embeddings = [response_data["embedding"]]
+            else:
                 # If we still can't find the embeddings
-                print(f"[Embedder] Available keys in response: {list(response_data.keys())}")
+                logger.debug("Available keys in response: %s", list(response_data.keys()))
                 raise Exception("Embedding field not found in response")
+
+            logger.debug("Successfully generated %d embeddings", len(embeddings))
+
+            # Cache new vectors in one transaction and slot them back in order
+            if self.cache is not None:
+                self.cache.put_many([(texts[i], emb) for i, emb in zip(miss_indices, embeddings)])
+            for i, emb in zip(miss_indices, embeddings):
+                if self.semantic_cache is not None:
+                    self.semantic_cache.put(texts[i], emb)
+                results[i] = emb
+            return results
                 
         except Exception as e:
-            print(f"[Embedder] Exception in generate_embeddings_batch: {str(e)}")
+            logger.error("Exception in generate_embeddings_batch: %s", str(e))
             raise
 
+    def generate_embeddings_many(
+        self,
+        texts: List[str],
+        batch_size: int = COHERE_BATCH_LIMIT,
+        concurrency: int = 4,
+        requests_per_second: float = 2.9
+    ) -> List[List[float]]:
+        """
+        Generate embeddings for many texts using concurrent batch requests.
+
+        Batches are dispatched to worker threads that share the pooled
+        session, overlapping network wait time while a token-bucket
+        limiter keeps the sustained request rate under Cohere's limit.
+
+        Args:
+            texts: List of texts to generate embeddings for
+            batch_size: Texts per API call (capped at Cohere's 96-text limit)
+            concurrency: Number of batch requests in flight at once
+            requests_per_second: Sustained request rate to allow
+
+        Returns:
+            List of embedding vectors in input order
+        """
+        batch_size = min(batch_size, COHERE_BATCH_LIMIT)
+        chunks = [texts[start:start + batch_size] for start in range(0, len(texts), batch_size)]
+        logger.debug("Generating embeddings for %d texts in %d batches (%d concurrent)...",
+                     len(texts), len(chunks), concurrency)
+
+        if len(chunks) <= 1:
+            return self.generate_embeddings_batch(texts) if texts else []
+
+        limiter = RateLimiter(requests_per_second)
+
+        def embed_chunk(chunk: List[str]) -> List[List[float]]:
+            limiter.acquire()
+            return self.generate_embeddings_batch(chunk)
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            batch_results = list(executor.map(embed_chunk, chunks))
+
+        embeddings = [emb for batch in batch_results for emb in batch]
+        logger.debug("Successfully generated %d embeddings across batches", len(embeddings))
+        return embeddings
+
 
 def load_file_text(file_path: str) -> str:
     """
@@ -183,11 +534,11 @@ def load_file_text(file_path: str) -> str:
 
 def save_embedding(embedding: List[float], output_path: str) -> None:
     """
-    Save an embedding to a file.
-    
+    Save an embedding to a binary .npy file.
+
     Args:
         embedding: The embedding vector to save
-        output_path: Path where to save the embedding
+        output_path: Path where to save the embedding (np.save appends .npy if missing)
     """
     try:
         # Ensure the directory exists
@@ -195,11 +546,12 @@ def save_embedding(embedding: List[float], output_path: str) -> None:
         if output_dir:
             os.makedirs(output_dir, exist_ok=True)
             print(f"[Embedder] Ensuring directory exists: {output_dir}")
-        
+
         print(f"[Embedder] Saving embedding to: {output_path}")
-        
-        with open(output_path, 'w') as f:
-            json.dump(embedding, f)
+
+        # float32 .npy is ~5x smaller than the old JSON text and loads
+        # without any parsing
+        np.save(output_path, np.asarray(embedding, dtype=np.float32))
         print(f"[Embedder] Embedding saved successfully to: {output_path}")
     except Exception as e:
         print(f"[Embedder] Error saving embedding: {str(e)}")
@@ -207,49 +559,188 @@ def save_embedding(embedding: List[float], output_path: str) -> None:
         raise
 
 
+# Ollama's local HTTP API; the server keeps the model warm between calls
+OLLAMA_ENDPOINT = "http://localhost:11434/api/generate"
+
+# Shared session so repeated Ollama calls reuse one TCP connection
+_ollama_session = requests.Session()
+
+
+def ollama_generate(prompt: str, model: str, timeout: int = 240) -> str:
+    """
+    Run a prompt through a local Ollama model.
+
+    Uses the persistent HTTP API so the server keeps the model loaded
+    between calls, avoiding the multi-second model-load cost that
+    spawning `ollama run` pays every time. Falls back to the CLI if the
+    server isn't reachable.
+
+    Args:
+        prompt: The prompt to send to the model
+        model: Ollama model name
+        timeout: Request timeout in seconds
+
+    Returns:
+        The model's response text
+    """
+    try:
+        response = _ollama_session.post(
+            OLLAMA_ENDPOINT,
+            json={"model": model, "prompt": prompt, "stream": False},
+            timeout=timeout
+        )
+        response.raise_for_status()
+        return response.json().get("response", "").strip()
+    except requests.RequestException as e:
+        print(f"[Ollama] HTTP API unavailable ({e}), falling back to CLI")
+
+    result = subprocess.run(
+        ["ollama", "run", model],
+        input=prompt.encode('utf-8'),  # Encode input as UTF-8
+        capture_output=True,
+        timeout=timeout
+    )
+    return result.stdout.decode('utf-8', errors='ignore').strip()
+
+
+def warm_up_ollama(model: str) -> None:
+    """
+    Pre-load an Ollama model so the first real call doesn't pay cold start.
+
+    Args:
+        model: Ollama model name to load
+    """
+    try:
+        _ollama_session.post(
+            OLLAMA_ENDPOINT,
+            json={"model": model, "prompt": "", "stream": False},
+            timeout=120
+        )
+        print(f"[Ollama] Pre-warmed model: {model}")
+    except requests.RequestException:
+        print(f"[Ollama] Could not pre-warm model {model} (server not reachable)")
+
+
+CV_FILTER_PROMPT = (
+    "You are a professional CV parser. Extract and structure the following CV data for job matching:\n\n"
+    "1. Professional Summary\n"
+    "2. Work Experience (with correct company names, locations, dates)\n"
+    "3. Education (with correct institution names)\n"
+    "4. Skills (technical and soft skills)\n"
+    "5. Languages\n"
+    "6. Projects\n"
+    "7. Certifications\n\n"
+    "Format the output clearly with section headers. Keep all location names and dates exactly as they appear.\n"
+    "Omit personal interests, hobbies, references, and irrelevant details.\n"
+    "Return ONLY the structured CV data in txt format without ANY explanations, asterisks or additional commentary AT ALL.\n\n"
+)
+
+
+def iter_text_chunks(file_path: str, max_chars: int = 6000):
+    """
+    Yield paragraph-aligned chunks of a text file without loading it fully.
+
+    Args:
+        file_path: Path to the text file
+        max_chars: Soft chunk size; chunks break at the next blank line
+            past this limit (or at twice the limit regardless)
+
+    Yields:
+        Text chunks of roughly max_chars characters
+    """
+    buffer: List[str] = []
+    size = 0
+
+    with open(file_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            buffer.append(line)
+            size += len(line)
+            # Prefer breaking at paragraph boundaries, but hard-break if the
+            # file has no blank lines
+            if size >= max_chars and (not line.strip() or size >= 2 * max_chars):
+                yield ''.join(buffer)
+                buffer = []
+                size = 0
+
+    if buffer:
+        yield ''.join(buffer)
+
+
+def filter_cv_file_with_ollama(input_path: str, model: str = "gemma3:4b",
+                               output_dir: Optional[str] = None) -> str:
+    """
+    Filter a CV file through Ollama chunk by chunk.
+
+    Streams paragraph-aligned chunks from disk, filters each through the
+    Ollama HTTP API, and appends results to the output file as they
+    complete, so the raw CV text is never held in memory all at once.
+
+    Args:
+        input_path: Path to the raw CV text file
+        model: Ollama model to use for filtering
+        output_dir: Directory to save filtered text output, can be None
+
+    Returns:
+        Filtered CV text
+    """
+    print(f"[Filter] Streaming CV through Ollama from: {input_path}")
+    print(f"[Filter] Using model: {model}")
+
+    # Load the model up front so the first chunk doesn't pay cold start
+    warm_up_ollama(model)
+
+    output_file = None
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        output_file = os.path.join(output_dir, f"filtered_cv_{timestamp}.txt")
+
+    filtered_parts: List[str] = []
+
+    try:
+        for chunk_num, chunk in enumerate(iter_text_chunks(input_path), start=1):
+            print(f"[Filter] Filtering chunk {chunk_num} ({len(chunk)} characters)...")
+            filtered_chunk = ollama_generate(CV_FILTER_PROMPT + f"CV Text:\n{chunk}", model, timeout=240)
+            filtered_parts.append(filtered_chunk)
+
+            # Append each chunk to disk as soon as it completes
+            if output_file:
+                with open(output_file, 'a', encoding='utf-8') as f:
+                    f.write(filtered_chunk + "\n")
+
+        if output_file:
+            print(f"[Filter] Saved filtered CV text to: {output_file}")
+
+        filtered_text = "\n".join(filtered_parts)
+        print(f"[Filter] Filtering complete. Output length: {len(filtered_text)} characters.")
+        return filtered_text
+
+    except Exception as e:
+        print(f"[Filter] Error streaming CV through Ollama: {str(e)}")
+        raise
+
+
 def filter_cv_with_ollama(raw_text: str, model: str = "gemma3:4b", output_dir: Optional[str] = None) -> str:
     """
     Filter CV text using Ollama with Gemma model.
-    
+
     Args:
         raw_text: Raw CV text to filter
         model: Ollama model to use for filtering
         output_dir: Directory to save filtered text output, can be None
-        
+
     Returns:
         Filtered CV text
         """
-    
-    prompt = (
-        "You are a professional CV parser. Extract and structure the following CV data for job matching:\n\n"
-        "1. Professional Summary\n"
-        "2. Work Experience (with correct company names, locations, dates)\n"
-        "3. Education (with correct institution names)\n"
-        "4. Skills (technical and soft skills)\n"
-        "5. Languages\n"
-        "6. Projects\n"
-        "7. Certifications\n\n"
-        "Format the output clearly with section headers. Keep all location names and dates exactly as they appear.\n"
-        "Omit personal interests, hobbies, references, and irrelevant details.\n"
-        "Return ONLY the structured CV data in txt format without ANY explanations, asterisks or additional commentary AT ALL.\n\n"
-        f"CV Text:\n{raw_text}"
-    )
+
+    prompt = CV_FILTER_PROMPT + f"CV Text:\n{raw_text}"
 
     try:
         print("[Filter] Calling Ollama locally with Gemma...")
         print(f"[Filter] Using model: {model}")
-        
-        # Use the encoding parameter with UTF-8 and errors='ignore' to handle problematic characters
-        result = subprocess.run(
-            ["ollama", "run", model],
-            input=prompt.encode('utf-8'),  # Encode input as UTF-8
-            capture_output=True,
-            timeout=240
-        )
 
-        # Decode output with error handling
-        filtered_text = result.stdout.decode('utf-8', errors='ignore').strip()
-        
+        filtered_text = ollama_generate(prompt, model, timeout=240)
+
         print(f"[Filter] Filtering complete. Output length: {len(filtered_text)} characters.")
         
         # Print debug preview of Gemma's output (first 200 chars)
@@ -265,7 +756,6 @@ def filter_cv_with_ollama(raw_text: str, model: str = "gemma3:4b", output_dir: O
                 os.makedirs(output_dir, exist_ok=True)
                 
                 # Generate timestamped filename
-                import datetime
                 timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
                 output_file = os.path.join(output_dir, f"filtered_cv_{timestamp}.txt")
                 
@@ -319,18 +809,9 @@ def extract_skills_with_ollama(description: str, model: str = "gemma3:4b") -> Li
     try:
         print("[SkillExtractor] Calling Ollama locally with Gemma...")
         print(f"[SkillExtractor] Using model: {model}")
-        
-        # Use the encoding parameter with UTF-8 and errors='ignore' to handle problematic characters
-        result = subprocess.run(
-            ["ollama", "run", model],
-            input=prompt.encode('utf-8'),  # Encode input as UTF-8
-            capture_output=True,
-            timeout=120
-        )
 
-        # Decode output with error handling
-        skills_text = result.stdout.decode('utf-8', errors='ignore').strip()
-        
+        skills_text = ollama_generate(prompt, model, timeout=120)
+
         # Use a helper function to count newlines to avoid escape sequence in f-string
         newline_count = skills_text.count('\n')
         print(f"[SkillExtractor] Extraction complete. Found approximately {newline_count + 1} skills.")
@@ -407,92 +888,199 @@ def format_job_for_embedding(job_data: Dict[str, Any]) -> str:
     skills = job_data.get("skills", [])
     location = job_data.get("location", "")
     source = job_data.get("source", "")
-    
-    # Format skills as a comma-separated string
-    skills_str = ", ".join(skills) if skills else ""
-    
-    # Build formatted text for embedding
-    formatted_text = f"Job Title: {title}\n\n"
-    formatted_text += f"Description: {description}\n\n"
-    
-    if skills_str:
-        formatted_text += f"Required Skills: {skills_str}\n\n"
-    
+
+    # Build the sections once and join them in a single pass; += on
+    # strings reallocates the whole buffer each time on this hot path
+    parts = [f"Job Title: {title}", f"Description: {description}"]
+
+    if skills:
+        parts.append(f"Required Skills: {', '.join(skills)}")
+
     if location:
-        formatted_text += f"Location: {location}\n\n"
-    
+        parts.append(f"Location: {location}")
+
     if source:
-        formatted_text += f"Source: {source}"
-    
+        parts.append(f"Source: {source}")
+
+    formatted_text = "\n\n".join(parts)
     print(f"[Embedder] Formatted job data for embedding ({len(formatted_text)} characters)")
     return formatted_text
 
 
-def save_job_to_database(job_data: Dict[str, Any], embedding: List[float], db_path: str) -> None:
+def job_content_hash(job_data: Dict[str, Any]) -> str:
+    """
+    Compute a stable content hash for a job record.
+
+    Args:
+        job_data: Dictionary containing job details
+
+    Returns:
+        SHA-256 hex digest of the job's formatted embedding text
+    """
+    return hashlib.sha256(format_job_for_embedding(job_data).encode('utf-8')).hexdigest()
+
+
+class JobStore:
+    """Context manager owning a single SQLite connection for job inserts.
+
+    Opening the database once per run (instead of once per job) and
+    committing batches in one transaction drops the per-row fsync cost
+    that dominates large ingest runs. WAL mode keeps readers unblocked
+    while the ingest writes.
+    """
+
+    CREATE_TABLE_SQL = '''
+    CREATE TABLE IF NOT EXISTS jobs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        title TEXT,
+        description TEXT,
+        location TEXT,
+        source TEXT,
+        skills TEXT,
+        embedding BLOB,
+        dim INT,
+        scale REAL,
+        content_hash TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    '''
+
+    # INSERT OR IGNORE + the unique index drops rows whose content hash
+    # is already stored, so re-runs never duplicate jobs
+    INSERT_SQL = '''
+    INSERT OR IGNORE INTO jobs (title, description, location, source, skills, embedding, dim, scale, content_hash)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    '''
+
+    def __init__(self, db_path: str, quantize: bool = False):
+        """
+        Initialize the store.
+
+        Args:
+            db_path: Path to the SQLite database
+            quantize: Store embeddings as int8 with a per-vector scale
+                instead of float32, shrinking vector storage 4x
+        """
+        self.db_path = db_path
+        self.quantize = quantize
+        self.conn: Optional[sqlite3.Connection] = None
+
+    def __enter__(self) -> "JobStore":
+        db_dir = os.path.dirname(self.db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA temp_store=MEMORY")
+        self.conn.execute(self.CREATE_TABLE_SQL)
+
+        # CREATE TABLE IF NOT EXISTS is a no-op on databases created before
+        # this schema, so add the newer columns individually before touching
+        # the index that depends on them
+        existing = {row[1] for row in self.conn.execute("PRAGMA table_info(jobs)")}
+        for column, column_type in (("dim", "INT"), ("scale", "REAL"), ("content_hash", "TEXT")):
+            if column not in existing:
+                self.conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {column_type}")
+
+        self.conn.execute(
+            "CREATE UNIQUE INDEX IF NOT EXISTS idx_jobs_content_hash ON jobs(content_hash)")
+        self.conn.commit()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    def _row_for_job(self, job_data: Dict[str, Any], embedding: List[float]) -> tuple:
+        skills = job_data.get("skills", [])
+        embedding_arr = np.asarray(embedding, dtype=np.float32)
+
+        if self.quantize:
+            # Symmetric int8 quantization: q = round(v / scale), scale chosen
+            # so the largest component maps to 127
+            scale = float(np.max(np.abs(embedding_arr))) / 127.0 if embedding_arr.size else 1.0
+            scale = scale or 1.0
+            blob = np.round(embedding_arr / scale).astype(np.int8).tobytes()
+        else:
+            scale = None
+            blob = embedding_arr.tobytes()
+
+        return (
+            job_data.get("title", ""),
+            job_data.get("description", ""),
+            job_data.get("location", ""),
+            job_data.get("source", ""),
+            json.dumps(skills) if skills else "[]",
+            blob,
+            embedding_arr.shape[0],
+            scale,
+            job_content_hash(job_data)
+        )
+
+    def insert(self, job_data: Dict[str, Any], embedding: List[float]) -> int:
+        """
+        Insert a single job with its embedding.
+
+        Args:
+            job_data: Dictionary containing job details
+            embedding: The embedding vector for the job
+
+        Returns:
+            Row ID of the inserted job
+        """
+        cursor = self.conn.execute(self.INSERT_SQL, self._row_for_job(job_data, embedding))
+        self.conn.commit()
+        return cursor.lastrowid
+
+    def has_content_hash(self, content_hash: str) -> bool:
+        """
+        Check whether a job with this content hash is already stored.
+
+        Args:
+            content_hash: SHA-256 hex digest of the formatted job text
+
+        Returns:
+            True if the hash exists in the jobs table
+        """
+        row = self.conn.execute(
+            "SELECT 1 FROM jobs WHERE content_hash = ?", (content_hash,)
+        ).fetchone()
+        return row is not None
+
+    def insert_many(self, jobs_with_embeddings: List[tuple]) -> None:
+        """
+        Insert multiple jobs with their embeddings in a single transaction.
+
+        Args:
+            jobs_with_embeddings: List of (job_data, embedding) tuples
+        """
+        rows = [self._row_for_job(job_data, embedding) for job_data, embedding in jobs_with_embeddings]
+        with self.conn:
+            self.conn.executemany(self.INSERT_SQL, rows)
+
+
+def save_job_to_database(job_data: Dict[str, Any], embedding: List[float], db_path: str,
+                         quantize: bool = False) -> None:
     """
     Save job details along with its embedding to a SQLite database.
-    
+
     Args:
         job_data: Dictionary containing job details
         embedding: The embedding vector for the job
         db_path: Path to SQLite database
+        quantize: Store the embedding as int8 instead of float32
     """
     try:
-        # Ensure the directory exists
-        db_dir = os.path.dirname(db_path)
-        if db_dir:
-            os.makedirs(db_dir, exist_ok=True)
-            print(f"[Embedder] Ensuring database directory exists: {db_dir}")
-        
         print(f"[Embedder] Saving job with embedding to database: {db_path}")
-        
-        # Extract job details
-        title = job_data.get("title", "")
-        description = job_data.get("description", "")
-        location = job_data.get("location", "")
-        source = job_data.get("source", "")
-        
-        # Handle skills array
-        skills = job_data.get("skills", [])
-        skills_str = json.dumps(skills) if skills else "[]"
-        
-        # Convert embedding to JSON string
-        embedding_json = json.dumps(embedding)
-        
-        # Connect to database
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        
-        # Create tables if they don't exist
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS jobs (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            title TEXT,
-            description TEXT,
-            location TEXT,
-            source TEXT,
-            skills TEXT,
-            embedding TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-        ''')
-        
-        # Insert job with embedding
-        cursor.execute(
-            '''
-            INSERT INTO jobs (title, description, location, source, skills, embedding)
-            VALUES (?, ?, ?, ?, ?, ?)
-            ''',
-            (title, description, location, source, skills_str, embedding_json)
-        )
-        
-        # Commit changes and close connection
-        conn.commit()
-        job_id = cursor.lastrowid
-        conn.close()
-        
+
+        with JobStore(db_path, quantize=quantize) as store:
+            job_id = store.insert(job_data, embedding)
+
         print(f"[Embedder] Job with embedding saved successfully to database with ID: {job_id}")
-        
+
     except sqlite3.Error as e:
         print(f"[Embedder] SQLite error: {str(e)}")
         raise
@@ -501,6 +1089,107 @@ def save_job_to_database(job_data: Dict[str, Any], embedding: List[float], db_pa
         raise
 
 
+def save_jobs_to_database(jobs_with_embeddings: List[tuple], db_path: str,
+                          quantize: bool = False) -> None:
+    """
+    Save multiple jobs with their embeddings to the database in a single transaction.
+
+    Args:
+        jobs_with_embeddings: List of (job_data, embedding) tuples
+        db_path: Path to SQLite database
+        quantize: Store embeddings as int8 instead of float32
+    """
+    try:
+        print(f"[Embedder] Saving {len(jobs_with_embeddings)} jobs to database: {db_path}")
+
+        # One connection, one transaction: SQLite fsyncs once, not once per row
+        with JobStore(db_path, quantize=quantize) as store:
+            store.insert_many(jobs_with_embeddings)
+
+        print(f"[Embedder] Successfully saved {len(jobs_with_embeddings)} jobs to database")
+
+    except sqlite3.Error as e:
+        print(f"[Embedder] SQLite error: {str(e)}")
+        raise
+    except Exception as e:
+        print(f"[Embedder] Error saving jobs to database: {str(e)}")
+        raise
+
+
+def _resolve_input(args, default_input_file: str):
+    """
+    Resolve the CV input source from command-line arguments.
+
+    Args:
+        args: Command-line arguments
+        default_input_file: Fallback CV path when none is specified
+
+    Returns:
+        Tuple of (text, cv_path); text is set for --text input, cv_path
+        for file-based input
+    """
+    if args.text:
+        return args.text, None
+    if args.file:
+        return "", args.file
+    print(f"[Embedder] No input file specified, using default: {default_input_file}")
+    return "", default_input_file
+
+
+def _save_original_text(text: str, output_dir: str) -> None:
+    """
+    Save unfiltered CV text to the filtered-output directory.
+
+    Args:
+        text: CV text to save
+        output_dir: Directory to write the timestamped file into
+    """
+    try:
+        os.makedirs(output_dir, exist_ok=True)
+        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        original_file = os.path.join(output_dir, f"original_cv_{timestamp}.txt")
+        with open(original_file, 'w', encoding='utf-8') as f:
+            f.write(text)
+        print(f"[Embedder] Saved original CV text to: {original_file}")
+    except Exception as e:
+        print(f"[Embedder] Warning: Could not save original text to file: {str(e)}")
+
+
+def _filter_cv_input(cv_path: str, model: str, skip_filter: bool,
+                     save_filtered: bool, filtered_output_dir: str) -> str:
+    """
+    Produce the text to embed from a CV file, filtering unless skipped.
+
+    Args:
+        cv_path: Path to the raw CV text file
+        model: Ollama model to use for filtering
+        skip_filter: Skip the Ollama filtering step entirely
+        save_filtered: Save filtered (or original) text to filtered_output_dir
+        filtered_output_dir: Directory for saved text output
+
+    Returns:
+        The CV text to embed
+    """
+    if skip_filter:
+        print("[Embedder] Skipping filtering step as requested")
+        text = load_file_text(cv_path)
+        if save_filtered:
+            _save_original_text(text, filtered_output_dir)
+        return text
+
+    try:
+        filter_output_dir = filtered_output_dir if save_filtered else None
+        # Stream the file through the filter chunk by chunk so the
+        # raw text is never fully held in memory
+        return filter_cv_file_with_ollama(cv_path, model=model, output_dir=filter_output_dir)
+    except Exception as e:
+        print(f"[Embedder] Filtering failed, using original text: {str(e)}")
+        text = load_file_text(cv_path)
+        if save_filtered and text:
+            _save_original_text(text, filtered_output_dir)
+        return text
+
+
 def main():
     """
     Main function to handle command-line embedding generation.
@@ -519,9 +1208,14 @@ def main():
     parser.add_argument("--db-path", type=str, help="Path to SQLite database for storing jobs with embeddings")
     parser.add_argument("--skip-skills-extraction", action="store_true", help="Skip skills extraction from job description")
     parser.add_argument("--gemma-model", type=str, default="gemma3:4b", help="Gemma model to use for text processing")
+    parser.add_argument("--quantize-embeddings", action="store_true",
+                      help="Store job embeddings as int8 (4x smaller) instead of float32")
     
     args = parser.parse_args()
-    
+
+    # Configure logging once; per-embed diagnostics stay behind DEBUG
+    logging.basicConfig(level=os.environ.get("LOGLEVEL", "INFO"))
+
     # Use the API key from args or fallback to hardcoded value
     api_key = args.api_key or ""
     
@@ -532,7 +1226,7 @@ def main():
         
         # Define default paths relative to project root
         default_input_file = os.path.join(project_root, "data", "sample_cv.txt")
-        default_output_file = os.path.join(project_root, "output", "embedding.json")
+        default_output_file = os.path.join(project_root, "output", "embedding.npy")
         filtered_output_dir = os.path.join(project_root, "output", "filtered")
         
         # Define default paths for job processing
@@ -556,63 +1250,12 @@ def main():
             if args.save_filtered:
                 print(f"[Embedder] Filtered output directory: {filtered_output_dir}")
             
-            # Initialize text variable to avoid "possibly unbound" errors
-            text = ""
-            raw_text = ""
-            
-            # Get input text
-            if args.text:
-                text = args.text
-            elif args.file:
-                # Use the provided file path
-                file_path = args.file
-                # First load the raw text
-                raw_text = load_file_text(file_path)
-            else:
-                # Use the default file path
-                print(f"[Embedder] No input file specified, using default: {default_input_file}")
-                raw_text = load_file_text(default_input_file)
-            
-            # Filter CV with Ollama if we loaded from a file and filtering is not skipped
-            if raw_text and not args.skip_filter:
-                try:
-                    # Set output directory for filtered text if save-filtered flag is set
-                    filter_output_dir = filtered_output_dir if args.save_filtered else None
-                    # Use the specified Gemma model if provided
-                    text = filter_cv_with_ollama(raw_text, model=gemma_model, output_dir=filter_output_dir)
-                except Exception as e:
-                    print(f"[Embedder] Filtering failed, using original text: {str(e)}")
-                    text = raw_text
-                    
-                    # Still save the original text if save-filtered flag is set
-                    if args.save_filtered and raw_text:
-                        try:
-                            import datetime
-                            os.makedirs(filtered_output_dir, exist_ok=True)
-                            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-                            original_file = os.path.join(filtered_output_dir, f"original_cv_{timestamp}.txt")
-                            with open(original_file, 'w', encoding='utf-8') as f:
-                                f.write(raw_text)
-                            print(f"[Embedder] Saved original CV text to: {original_file}")
-                        except Exception as save_error:
-                            print(f"[Embedder] Warning: Could not save original text to file: {str(save_error)}")
-            elif raw_text and args.skip_filter:
-                print("[Embedder] Skipping filtering step as requested")
-                text = raw_text
-                
-                # Save the original text if save-filtered flag is set
-                if args.save_filtered:
-                    try:
-                        import datetime
-                        os.makedirs(filtered_output_dir, exist_ok=True)
-                        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-                        original_file = os.path.join(filtered_output_dir, f"original_cv_{timestamp}.txt")
-                        with open(original_file, 'w', encoding='utf-8') as f:
-                            f.write(raw_text)
-                        print(f"[Embedder] Saved original CV text to: {original_file}")
-                    except Exception as e:
-                        print(f"[Embedder] Warning: Could not save original text to file: {str(e)}")
-            
+            # Resolve the input source, then filter file-based input
+            text, cv_path = _resolve_input(args, default_input_file)
+            if cv_path:
+                text = _filter_cv_input(cv_path, gemma_model, args.skip_filter,
+                                        args.save_filtered, filtered_output_dir)
+
             # Ensure text is not empty before generating embedding
             if text:
                 # Generate embedding
@@ -693,7 +1336,7 @@ def process_single_job(args, embedder, default_db_path):
                 db_path = args.db_path if args.db_path else default_db_path
                 
                 # Save job with embedding to database
-                save_job_to_database(job, embedding, db_path)
+                save_job_to_database(job, embedding, db_path, quantize=args.quantize_embeddings)
             else:
                 print(f"[Embedder] Warning: Expected dictionary for job data, but got {type(job).__name__}")
     else:
@@ -726,7 +1369,7 @@ def process_single_job(args, embedder, default_db_path):
             db_path = args.db_path if args.db_path else default_db_path
             
             # Save job with embedding to database
-            save_job_to_database(job_data, embedding, db_path)
+            save_job_to_database(job_data, embedding, db_path, quantize=args.quantize_embeddings)
         else:
             print(f"[Embedder] Warning: Expected dictionary for job data, but got {type(job_data).__name__}")
 
@@ -759,46 +1402,94 @@ def process_job_directory(args, embedder, default_job_dir, default_db_path):
             print(f"[Embedder] No job files found in directory: {job_dir}")
             return
         
-        # Process each job file
+        # First pass: load, extract skills, and format each job. The work is
+        # almost entirely blocked on Ollama I/O, so files are processed by a
+        # thread pool; results keep the job_files order so embeddings line up.
+        def prepare_job(job_file: str):
+            # Full path to job file
+            job_file_path = os.path.join(job_dir, job_file)
+            print(f"\n[Embedder] Processing job file: {job_file}")
+
+            # Load job data from file
+            job_data = load_job_json(job_file_path)
+
+            if not isinstance(job_data, dict):  # Ensure job_data is a dictionary
+                print(f"[Embedder] Warning: Expected dictionary for job data, but got {type(job_data).__name__}")
+                return None
+
+            # Extract skills from job description if needed and not skipped
+            if (not job_data.get("skills") or len(job_data.get("skills", [])) == 0) and not args.skip_skills_extraction:
+                description = job_data.get("description", "")
+                if description:
+                    print("[Embedder] No skills found in job data, extracting skills from description...")
+                    extracted_skills = extract_skills_with_ollama(description, model=args.gemma_model)
+                    job_data["skills"] = extracted_skills
+                    print(f"[Embedder] Added {len(extracted_skills)} extracted skills to job data")
+            elif args.skip_skills_extraction and (not job_data.get("skills") or len(job_data.get("skills", [])) == 0):
+                print("[Embedder] Skills extraction skipped, using empty skills list")
+                job_data["skills"] = []
+
+            # Format job data for embedding
+            return job_data, format_job_for_embedding(job_data)
+
+        jobs = []
+        texts = []
+
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            futures = {executor.submit(prepare_job, job_file): job_file for job_file in job_files}
+            prepared = {}
+            for future in as_completed(futures):
+                job_file = futures[future]
+                try:
+                    prepared[job_file] = future.result()
+                except Exception as e:
+                    print(f"[Embedder] Error processing job file {job_file}: {str(e)}")
+                    print("[Embedder] Continuing with next file...")
+
         for job_file in job_files:
-            try:
-                # Full path to job file
-                job_file_path = os.path.join(job_dir, job_file)
-                print(f"\n[Embedder] Processing job file: {job_file}")
-                
-                # Load job data from file
-                job_data = load_job_json(job_file_path)
-                
-                if isinstance(job_data, dict):  # Ensure job_data is a dictionary
-                    # Extract skills from job description if needed and not skipped
-                    if (not job_data.get("skills") or len(job_data.get("skills", [])) == 0) and not args.skip_skills_extraction:
-                        description = job_data.get("description", "")
-                        if description:
-                            print("[Embedder] No skills found in job data, extracting skills from description...")
-                            extracted_skills = extract_skills_with_ollama(description, model=args.gemma_model)
-                            job_data["skills"] = extracted_skills
-                            print(f"[Embedder] Added {len(extracted_skills)} extracted skills to job data")
-                    elif args.skip_skills_extraction and (not job_data.get("skills") or len(job_data.get("skills", [])) == 0):
-                        print("[Embedder] Skills extraction skipped, using empty skills list")
-                        job_data["skills"] = []
-                    
-                    # Format job data for embedding
-                    formatted_job = format_job_for_embedding(job_data)
-                    
-                    # Generate embedding
-                    embedding = embedder.generate_embedding(formatted_job)
-                    
-                    # Save job with embedding to database
-                    save_job_to_database(job_data, embedding, db_path)
-                else:
-                    print(f"[Embedder] Warning: Expected dictionary for job data, but got {type(job_data).__name__}")
-                
-            except Exception as e:
-                print(f"[Embedder] Error processing job file {job_file}: {str(e)}")
-                print("[Embedder] Continuing with next file...")
-                continue
-        
-        print(f"\n[Embedder] Completed processing {len(job_files)} job files")
+            result = prepared.get(job_file)
+            if result is not None:
+                job_data, text = result
+                jobs.append(job_data)
+                texts.append(text)
+
+        if not jobs:
+            print("[Embedder] No valid jobs to embed")
+            return
+
+        # Drop jobs whose content is already stored (from this run or a
+        # previous one) before paying for their embeddings
+        seen = set()
+        unique_jobs = []
+        unique_texts = []
+        with JobStore(db_path) as store:
+            for job_data, text in zip(jobs, texts):
+                content_hash = hashlib.sha256(text.encode('utf-8')).hexdigest()
+                if content_hash in seen or store.has_content_hash(content_hash):
+                    print(f"[Embedder] Skipping duplicate job: {job_data.get('title', '')}")
+                    continue
+                seen.add(content_hash)
+                unique_jobs.append(job_data)
+                unique_texts.append(text)
+
+        if len(unique_jobs) < len(jobs):
+            print(f"[Embedder] Deduplicated {len(jobs) - len(unique_jobs)} of {len(jobs)} jobs")
+        jobs, texts = unique_jobs, unique_texts
+
+        if not jobs:
+            print("[Embedder] All jobs already embedded, nothing to do")
+            return
+
+        # Second pass: embed all jobs in batches of up to 96 texts
+        # (Cohere's per-call limit), issuing batch requests concurrently
+        # under a rate limit instead of one call per job
+        embeddings = embedder.generate_embeddings_many(texts)
+
+        # Save all jobs with their embeddings in a single transaction
+        save_jobs_to_database(list(zip(jobs, embeddings)), db_path,
+                              quantize=getattr(args, "quantize_embeddings", False))
+
+        print(f"\n[Embedder] Completed processing {len(jobs)} job files")
         
     except Exception as e:
         print(f"[Embedder] Error accessing job directory {job_dir}: {str(e)}")